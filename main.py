@@ -14,17 +14,17 @@ Mobile:  Left stick = move, ATTACK/DASH buttons
 1/2/3 switch Overworld/Nether/End. P pause. R restart. Esc quit (desktop).
 """
 
-import os, random, asyncio
+import os, sys, math, random, asyncio
 from dataclasses import dataclass
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Dict
 
 import pygame
 
 # --- on-canvas error overlay for web ---
 def _draw_error_overlay(screen, lines):
     screen.fill((12, 10, 16))
-    font_big = pygame.font.Font(None, 36)
-    font_sm  = pygame.font.Font(None, 20)
+    font_big = _font(36)
+    font_sm  = _font(20)
     title = font_big.render("An error occurred:", True, (255, 210, 210))
     screen.blit(title, (40, 40))
     y = 90
@@ -38,6 +38,11 @@ def _draw_error_overlay(screen, lines):
 
 WIDTH, HEIGHT = 1000, 640
 FPS = 60
+IS_WEB = sys.platform == "emscripten"  # pygbag
+# The on-canvas error overlay is the only way to see a traceback in the browser;
+# natively it is opt-in (MOB_HUNTERS_DEBUG=1) and errors otherwise propagate.
+DEBUG = os.environ.get("MOB_HUNTERS_DEBUG") == "1"
+ERROR_OVERLAY = IS_WEB or DEBUG
 TILE = 32
 
 OVERWORLD, NETHER, END = "OVERWORLD", "NETHER", "END"
@@ -70,30 +75,73 @@ COL = {
     "btn_border": (120, 130, 150),
     "btn_active": (120, 180, 255),
 }
+# pre-build Color objects so draw calls skip the tuple -> color conversion;
+# Color is unhashable, so caches key on tuple(color)
+COL = {k: pygame.Color(v) for k, v in COL.items()}
+
+# colors used every frame, bound once so draw code skips the dict lookup
+C_HUD, C_P1 = COL["hud"], COL["p1"]
+C_HP_OK, C_HP_LOW = COL["hp_ok"], COL["hp_low"]
+C_STICK_BASE, C_STICK_NUB = COL["stick_base"], COL["stick_nub"]
+C_BTN_BG, C_BTN_ACTIVE = COL["btn_bg"], COL["btn_active"]
+C_BTN_BORDER, C_BTN_FG = COL["btn_border"], COL["btn_fg"]
 
 MAX_LIVE_MOBS = 25
 MAX_ALIVE_ANIMALS = 7
+HUD_MOBS_FMT = "Live mobs: {}/%d" % MAX_LIVE_MOBS
+HUD_ANIMALS_FMT = "Animals: {}/%d" % MAX_ALIVE_ANIMALS
 
 # ----------------------------- Helpers --------------------------------
 
 def clamp(v, lo, hi): return max(lo, min(hi, v))
 
+def _display_alpha(surf: pygame.Surface) -> pygame.Surface:
+    # convert_alpha needs a display mode; keep the raw surface before set_mode
+    try:
+        return surf.convert_alpha()
+    except pygame.error:
+        return surf
+
+# Font(None, size) re-parses the default TTF, and most HUD strings repeat
+# frame to frame, so both fonts and rendered text are cached.
+_FONTS: Dict[int, pygame.font.Font] = {}
+_TEXT_CACHE: Dict[Tuple[str, int, Tuple[int,...]], pygame.Surface] = {}
+_TEXT_CACHE_MAX = 256
+
+def _font(size: int) -> pygame.font.Font:
+    f = _FONTS.get(size)
+    if f is None: f = _FONTS[size] = pygame.font.Font(None, size)
+    return f
+
+def _render_text(text: str, size: int, color) -> pygame.Surface:
+    key = (text, size, tuple(color))
+    im = _TEXT_CACHE.get(key)
+    if im is None:
+        # drop the oldest entry so changing strings (score, counters) can't grow it
+        if len(_TEXT_CACHE) >= _TEXT_CACHE_MAX: del _TEXT_CACHE[next(iter(_TEXT_CACHE))]
+        im = _TEXT_CACHE[key] = _display_alpha(_font(size).render(text, True, color))
+    return im
+
 def draw_text(surf, text, pos, size=24, color=(255,255,255), center=False):
-    font = pygame.font.Font(None, size)
-    im = font.render(text, True, color)
+    im = _render_text(text, size, color)
     r = im.get_rect()
     if center: r.center = pos
     else: r.topleft = pos
     surf.blit(im, r)
     return r
 
+# Entity name labels never change, so render each (name, color) once
+_NAME_SURFS: Dict[Tuple[str, Tuple[int,int,int]], pygame.Surface] = {}
+
+def _get_name_surf(name: str, color) -> pygame.Surface:
+    key = (name, tuple(color))
+    im = _NAME_SURFS.get(key)
+    if im is None: im = _NAME_SURFS[key] = _display_alpha(_font(14).render(name, True, color))
+    return im
+
 def is_down(pressed, key_constant) -> int:
-    try:
-        return 1 if pressed[key_constant] else 0
-    except (IndexError, TypeError):
-        sc = pygame.key.get_scancode_from_key(key_constant)
-        if 0 <= sc < len(pressed): return 1 if pressed[sc] else 0
-        return 0
+    # pygame-ce's get_pressed() returns a ScancodeWrapper indexed by K_* directly
+    return 1 if pressed[key_constant] else 0
 
 # FIX 1/2: mouse helper safe for pygbag (get_pressed can be empty)
 def mouse_left_down() -> bool:
@@ -175,11 +223,36 @@ ICON_FILES = {
     "Cow": "assets/cow.png",
 }
 
+# Built surfaces are shared by every entity of the same kind/size; blitting
+# never mutates the source, so one Surface per key is enough.
+_PNG_CACHE: Dict[str, Optional[pygame.Surface]] = {}
+_SPRITE_CACHE: Dict[Tuple[str, Tuple[int,int], Tuple[int,int,int]], pygame.Surface] = {}
+
+# PNGs shipped in ./assets. Probing a missing file under pygbag costs a network
+# round trip, so loads are skipped for anything not listed here. listdir is
+# preferred (drop-in art just works); the static list covers web builds where
+# it fails or comes back empty.
+ASSET_MANIFEST = (
+    "blaze.png", "chicken.png", "cow.png", "ender_dragon.png", "ghast.png",
+    "pig.png", "pigman.png", "player.png", "skeleton.png", "spider.png",
+    "villager.png", "wither_skeleton.png", "zombie.png",
+)
+try:
+    _ASSETS = frozenset(os.listdir("assets")) or frozenset(ASSET_MANIFEST)
+except OSError:
+    _ASSETS = frozenset(ASSET_MANIFEST)
+
 def _try_load_png(path: str) -> Optional[pygame.Surface]:
+    if path in _PNG_CACHE: return _PNG_CACHE[path]
+    if os.path.basename(path) not in _ASSETS:
+        _PNG_CACHE[path] = None
+        return None
     try:
-        return pygame.image.load(path).convert_alpha()
+        img = pygame.image.load(path).convert_alpha()
     except Exception:
-        return None
+        img = None
+    _PNG_CACHE[path] = img
+    return img
 
 def _make_placeholder(kind_name: str, size: Tuple[int,int], main_color=(230,230,230)) -> pygame.Surface:
     w, h = size
@@ -213,9 +286,12 @@ def _make_placeholder(kind_name: str, size: Tuple[int,int], main_color=(230,230,
     else:
         pygame.draw.circle(surf, (200,200,220), center, min(w,h)//3)
     pygame.draw.rect(surf, (0,0,0,160), (0,0,w,h), width=2, border_radius=8)
-    return surf
+    return _display_alpha(surf)
 
 def make_sprite(name: str, size: Tuple[int,int], fallback_color=(230,230,240)) -> pygame.Surface:
+    key = (name, tuple(size), tuple(fallback_color))
+    cached = _SPRITE_CACHE.get(key)
+    if cached is not None: return cached
     path = ICON_FILES.get(name, "")
     img = _try_load_png(path)
     if img:
@@ -224,17 +300,68 @@ def make_sprite(name: str, size: Tuple[int,int], fallback_color=(230,230,240)) -
         outline = pygame.Surface((size[0]+4, size[1]+4), pygame.SRCALPHA)
         outline.blit(img, (2,2))
         pygame.draw.rect(outline, (0,0,0,160), outline.get_rect(), 2, border_radius=8)
-        return outline
-    return _make_placeholder(name, (size[0]+4, size[1]+4), fallback_color)
+        sprite = _display_alpha(outline)
+    else:
+        sprite = _make_placeholder(name, (size[0]+4, size[1]+4), fallback_color)
+    assert sprite.get_flags() & pygame.SRCALPHA, name
+    _SPRITE_CACHE[key] = sprite
+    return sprite
+
+# One pre-rasterized slash ring per weapon range, blitted while the slash shows.
+# Stored premultiplied so it can go through the cheaper BLEND_PREMULTIPLIED path.
+_SLASH_SURFS: Dict[int, pygame.Surface] = {}
+
+def _slash_surf(radius: int) -> pygame.Surface:
+    s = _SLASH_SURFS.get(radius)
+    if s is None:
+        s = pygame.Surface((2*radius, 2*radius), pygame.SRCALPHA)
+        pygame.draw.circle(s, COL["slash"], (radius, radius), radius, 2)
+        s = _SLASH_SURFS[radius] = _display_alpha(s).premul_alpha()
+    return s
+
+# Weapon drops and health packs are pre-drawn tiles (one per kind/size) so the
+# whole loot layer goes out in a single fblits call
+_LOOT_SURFS: Dict[Tuple[str, Tuple[int,int]], pygame.Surface] = {}
+
+def _loot_surf(kind: str, size: Tuple[int,int]) -> pygame.Surface:
+    key = (kind, size)
+    s = _LOOT_SURFS.get(key)
+    if s is None:
+        w, h = size
+        s = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(s, COL[kind], (0, 0, w, h), border_radius=4)
+        if kind == "pack":
+            cx, cy = w//2, h//2
+            pygame.draw.line(s, (20,60,30), (cx-5, cy), (cx+5, cy), 2)
+            pygame.draw.line(s, (20,60,30), (cx, cy-5), (cx, cy+5), 2)
+        s = _LOOT_SURFS[key] = _display_alpha(s)
+    return s
 
 # ----------------------------- Entities --------------------------------
 
 class Entity:
+    # slots on the many-instance classes (Entity, Mob, Animal, Arrow) keep them
+    # __dict__-free; Player is a singleton and keeps a normal __dict__
+    __slots__ = ("rect", "color", "image")
+
     def __init__(self, x, y, w, h, color=(255,255,255)):
         self.rect = pygame.Rect(x, y, w, h)
         self.color = color
         self.image: Optional[pygame.Surface] = None  # sprite image centered on rect
 
+    def dirty_rect(self) -> pygame.Rect:
+        """Screen area touched when drawn: sprite plus any name label / HP bar above it."""
+        r = self.image.get_rect(center=self.rect.center) if self.image else self.rect.copy()
+        name = getattr(self, "name_surf", None)
+        if name: r.union_ip(name.get_rect(center=(self.rect.centerx, self.rect.top - 14)))
+        return r.inflate(4, 4)
+
+    def sprite_blit(self):
+        """(image, topleft) pair for Surface.fblits, or None when there is no image."""
+        if not self.image: return None
+        w, h = self.image.get_size()
+        return (self.image, (self.rect.centerx - w//2, self.rect.centery - h//2))
+
 class Player(Entity):
     def __init__(self, x, y, color):
         super().__init__(x, y, 26, 26, color)
@@ -249,14 +376,26 @@ class Player(Entity):
         self.slash_timer = 0
         self.slash_radius = 0
 
-    def try_attack(self, targets_rects: List[pygame.Rect]):
-        now = pygame.time.get_ticks()
-        if now - self.last_attack < self.weapon.cooldown_ms: return []
-        center = pygame.Vector2(self.rect.center)
+    def sync_draw_rects(self):
+        """Refresh the cached outline rect / center / sprite position after the rect moves."""
+        r = self.rect
+        self._outline_rect = r.inflate(4, 4)
+        self._center = r.center
+        if self.image:
+            w, h = self.image.get_size()
+            self._sprite_pos = (r.centerx - w//2, r.centery - h//2)
+
+    def attack_ready(self, now) -> bool:
+        return now - self.last_attack >= self.weapon.cooldown_ms
+
+    def try_attack(self, targets_rects: List[pygame.Rect], now: int):
+        if not self.attack_ready(now): return []
+        cx, cy = self.rect.center
+        r2 = self.weapon.range_px * self.weapon.range_px
         hits_idx = []
-        for i, r in enumerate(targets_rects):
-            if r is None: continue
-            if center.distance_to(r.center) <= self.weapon.range_px:
+        for i, (tx, ty) in enumerate([r.center for r in targets_rects]):
+            dx = tx - cx; dy = ty - cy
+            if dx*dx + dy*dy <= r2:
                 hits_idx.append(i)
         if hits_idx:
             self.last_attack = now
@@ -277,6 +416,9 @@ class Player(Entity):
             if self.slash_timer < 0: self.slash_timer = 0
 
 class Mob(Entity):
+    __slots__ = ("kind", "hp", "max_hp", "alive", "knockback", "is_archer", "shots_left",
+                 "last_shot_time", "shot_cooldown_ms", "shot_range", "name_surf")
+
     def __init__(self, kind: MobKind, x, y):
         color = COL[kind.color_key]
         super().__init__(x, y, 24, 24, color)
@@ -290,98 +432,113 @@ class Mob(Entity):
         self.last_shot_time = 0
         self.shot_cooldown_ms = 950
         self.shot_range = 380
+        self.name_surf = _get_name_surf(kind.name, (255,255,255))
 
     def ai(self, target_pos: Tuple[int,int]):
         if not self.alive: return
-        dir_vec = pygame.Vector2(target_pos) - self.rect.center
-        if dir_vec.length_squared() > 0: dir_vec = dir_vec.normalize() * self.kind.speed
-        self.rect.x += int(dir_vec.x + self.knockback.x)
-        self.rect.y += int(dir_vec.y + self.knockback.y)
-        self.rect.x = clamp(self.rect.x, 4, WIDTH-4-self.rect.w)
-        self.rect.y = clamp(self.rect.y, 64, HEIGHT-4-self.rect.h)
-        self.knockback *= 0.85
-        if self.knockback.length() < 0.2: self.knockback.xy = (0, 0)
+        # scalar math: no Vector2 allocations per mob per frame
+        r = self.rect
+        tx, ty = target_pos
+        cx, cy = r.center
+        dx = tx - cx; dy = ty - cy
+        d2 = dx*dx + dy*dy
+        if d2 > 0:
+            inv = self.kind.speed / math.sqrt(d2)
+            dx *= inv; dy *= inv
+        kb = self.knockback
+        r.x = clamp(r.x + int(dx + kb.x), 4, WIDTH-4-r.w)
+        r.y = clamp(r.y + int(dy + kb.y), 64, HEIGHT-4-r.h)
+        if kb.x or kb.y:
+            kb *= 0.85
+            if kb.length_squared() < 0.04: kb.xy = (0, 0)
 
     def draw(self, surf):
-        if self.image:
-            r = self.image.get_rect(center=self.rect.center)
-            surf.blit(self.image, r.topleft)
-        else:
+        # the sprite itself is batched in Game.render via sprite_blit()
+        if not self.image:
             pygame.draw.rect(surf, self.color, self.rect, border_radius=6)
-        draw_text(surf, self.kind.name, (self.rect.centerx, self.rect.top - 14),
-                  size=14, color=(255,255,255), center=True)
+        surf.blit(self.name_surf, self.name_surf.get_rect(center=(self.rect.centerx, self.rect.top - 14)))
         frac = self.hp / max(1, self.max_hp)
         w, h = self.rect.w, 4
         bg = pygame.Rect(self.rect.x, self.rect.top - 8, w, h)
         hp = pygame.Rect(self.rect.x, self.rect.top - 8, int(w * frac), h)
-        pygame.draw.rect(surf, (40,40,40), bg)
-        pygame.draw.rect(surf, (200,40,40), hp)
+        surf.fill((40,40,40), bg)
+        surf.fill((200,40,40), hp)
 
 class Animal(Entity):
+    __slots__ = ("kind", "hp", "max_hp", "alive", "_dir_x", "_dir_y", "_change_dir_timer", "name_surf")
+
     def __init__(self, kind: AnimalKind, x, y):
         super().__init__(x, y, 22, 22, kind.color)
         self.kind = kind
         self.hp = kind.hp
         self.max_hp = kind.hp
         self.alive = True
-        self._dir = pygame.Vector2(random.uniform(-1,1), random.uniform(-1,1))
-        if self._dir.length_squared() == 0: self._dir.xy = (1,0)
-        self._dir = self._dir.normalize()
+        self._pick_dir()
+        self.name_surf = _get_name_surf(kind.name, (230,255,230))
+
+    def _pick_dir(self):
+        dx, dy = random.uniform(-1,1), random.uniform(-1,1)
+        d2 = dx*dx + dy*dy
+        if d2 == 0: dx, dy, d2 = 1.0, 0.0, 1.0
+        inv = 1.0 / math.sqrt(d2)
+        self._dir_x = dx * inv; self._dir_y = dy * inv
         self._change_dir_timer = random.randint(900, 1800)
 
     def ai(self):
         if not self.alive: return
         self._change_dir_timer -= 1000 / FPS
-        if self._change_dir_timer <= 0:
-            self._dir = pygame.Vector2(random.uniform(-1,1), random.uniform(-1,1))
-            if self._dir.length_squared() == 0: self._dir.xy = (1,0)
-            self._dir = self._dir.normalize()
-            self._change_dir_timer = random.randint(900, 1800)
-        vel = self._dir * self.kind.speed
-        self.rect.x += int(vel.x); self.rect.y += int(vel.y)
-        if self.rect.left <= 4 or self.rect.right >= WIDTH-4: self._dir.x *= -1
-        if self.rect.top <= 64 or self.rect.bottom >= HEIGHT-4: self._dir.y *= -1
-        self.rect.x = clamp(self.rect.x, 4, WIDTH-4-self.rect.w)
-        self.rect.y = clamp(self.rect.y, 64, HEIGHT-4-self.rect.h)
+        if self._change_dir_timer <= 0: self._pick_dir()
+        r = self.rect
+        spd = self.kind.speed
+        r.x += int(self._dir_x * spd); r.y += int(self._dir_y * spd)
+        if r.left <= 4 or r.right >= WIDTH-4: self._dir_x = -self._dir_x
+        if r.top <= 64 or r.bottom >= HEIGHT-4: self._dir_y = -self._dir_y
+        r.x = clamp(r.x, 4, WIDTH-4-r.w)
+        r.y = clamp(r.y, 64, HEIGHT-4-r.h)
 
     def draw(self, surf):
-        if self.image:
-            r = self.image.get_rect(center=self.rect.center)
-            surf.blit(self.image, r.topleft)
-        else:
+        # the sprite itself is batched in Game.render via sprite_blit()
+        if not self.image:
             pygame.draw.rect(surf, self.color, self.rect, border_radius=6)
-        draw_text(surf, self.kind.name, (self.rect.centerx, self.rect.top - 14),
-                  size=14, color=(230,255,230), center=True)
+        surf.blit(self.name_surf, self.name_surf.get_rect(center=(self.rect.centerx, self.rect.top - 14)))
         frac = self.hp / max(1, self.max_hp)
         w, h = self.rect.w, 3
         bg = pygame.Rect(self.rect.x, self.rect.top - 8, w, h)
         hp = pygame.Rect(self.rect.x, self.rect.top - 8, int(w * frac), h)
-        pygame.draw.rect(surf, (40,60,40), bg)
-        pygame.draw.rect(surf, (90,220,120), hp)
+        surf.fill((40,60,40), bg)
+        surf.fill((90,220,120), hp)
 
 # ----------------------------- Projectiles --------------------------------
 
 class Arrow:
+    __slots__ = ("x", "y", "vx", "vy", "rect", "dmg", "alive", "ttl_ms", "image")
+
     def __init__(self, x, y, vx, vy, dmg=12):
-        self.pos = pygame.Vector2(x, y)
-        self.vel = pygame.Vector2(vx, vy)
+        self.x, self.y = float(x), float(y)
+        self.vx, self.vy = float(vx), float(vy)
         self.rect = pygame.Rect(int(x)-3, int(y)-3, 6, 6)
         self.dmg = dmg
         self.alive = True
         self.ttl_ms = 3500
+        # velocity never changes, so the head + tail image is drawn once
+        half = 14
+        self.image = pygame.Surface((2*half, 2*half), pygame.SRCALPHA)
+        pygame.draw.circle(self.image, COL["arrow"], (half, half), 3)
+        pygame.draw.line(self.image, COL["arrow"], (half, half),
+                         (half - int(self.vx*2), half - int(self.vy*2)), 2)
+        self.image = _display_alpha(self.image)
     def update(self, dt_ms):
         if not self.alive: return
-        self.pos += self.vel
-        self.rect.center = (int(self.pos.x), int(self.pos.y))
+        self.x += self.vx; self.y += self.vy
+        r = self.rect
+        r.x = int(self.x) - 3; r.y = int(self.y) - 3
         self.ttl_ms -= dt_ms
-        if self.ttl_ms <= 0: self.alive = False
-        if (self.rect.right < 0 or self.rect.left > WIDTH or
-            self.rect.bottom < 0 or self.rect.top > HEIGHT):
+        if (self.ttl_ms <= 0 or r.right < 0 or r.left > WIDTH or
+            r.bottom < 0 or r.top > HEIGHT):
             self.alive = False
-    def draw(self, surf):
-        pygame.draw.circle(surf, COL["arrow"], self.rect.center, 3)
-        tail = (self.rect.centerx - int(self.vel.x*2), self.rect.centery - int(self.vel.y*2))
-        pygame.draw.line(surf, COL["arrow"], self.rect.center, tail, 2)
+    def sprite_blit(self):
+        """(image, topleft) pair for Surface.fblits."""
+        return (self.image, (self.rect.centerx - 14, self.rect.centery - 14))
 
 # ----------------------------- Virtual Controls ---------------------------
 
@@ -435,6 +592,11 @@ class VirtualPad:
         if v.length() < 8: self.move_vec.update(0,0)
         else: self.move_vec = v.normalize()
 
+    def stick_area(self) -> pygame.Rect:
+        # the nub can sit a full base radius out, so cover its radius too (+2px outline, +2px slack)
+        r = self.stick_base_r + self.stick_nub_r + 4
+        return pygame.Rect(self.stick_center.x - r, self.stick_center.y - r, 2*r, 2*r)
+
     def consume_attack_tap(self) -> bool:
         if self._attack_latch:
             self._attack_latch = False
@@ -442,17 +604,17 @@ class VirtualPad:
         return False
 
     def draw(self, surf):
-        pygame.draw.circle(surf, COL["stick_base"], self.stick_center, self.stick_base_r)
+        pygame.draw.circle(surf, C_STICK_BASE, self.stick_center, self.stick_base_r)
         pygame.draw.circle(surf, (20, 22, 28), self.stick_center, self.stick_base_r, width=3)
-        pygame.draw.circle(surf, COL["stick_nub"], self.nub_pos, self.stick_nub_r)
+        pygame.draw.circle(surf, C_STICK_NUB, self.nub_pos, self.stick_nub_r)
         pygame.draw.circle(surf, (50, 60, 70), self.nub_pos, self.stick_nub_r, width=2)
         for rect, label, active in [
             (self.btn_attack, "ATTACK", self.attack_pressed),
             (self.btn_dash,   "DASH",   self.dash_pressed),
         ]:
-            pygame.draw.rect(surf, COL["btn_active"] if active else COL["btn_bg"], rect, border_radius=10)
-            pygame.draw.rect(surf, COL["btn_border"], rect, width=3, border_radius=10)
-            draw_text(surf, label, rect.center, 24, COL["btn_fg"], center=True)
+            pygame.draw.rect(surf, C_BTN_ACTIVE if active else C_BTN_BG, rect, border_radius=10)
+            pygame.draw.rect(surf, C_BTN_BORDER, rect, width=3, border_radius=10)
+            draw_text(surf, label, rect.center, 24, C_BTN_FG, center=True)
 
 # ----------------------------- Game ------------------------------------
 
@@ -463,6 +625,11 @@ class Game:
         # FIX 3: avoid DOUBLEBUF for pygbag; plain set_mode like the old good build
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         self.clock = pygame.time.Clock()
+        # drop everything we never handle (text input, window/audio noise) at the SDL layer
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP,
+                                  pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION,
+                                  pygame.WINDOWEXPOSED])
 
         self.theme = OVERWORLD
         self.prev_theme = self.theme
@@ -474,9 +641,23 @@ class Game:
 
         self.portal_n = pygame.Rect(10, 70, 26, 120)
         self.portal_e = pygame.Rect(WIDTH-36, 70, 26, 120)
+        self._bg_cache = {t: self._build_bg(t) for t in (OVERWORLD, NETHER, END)}
+        self._hud_cache: Dict[str, Tuple[object, pygame.Surface]] = {}
+        self._bar_cache: Dict[Tuple[int,int,int,int], Tuple[tuple, pygame.Surface]] = {}
 
         self.p1 = Player(x=WIDTH//2-20, y=HEIGHT//2, color=COL["p1"])
         self.p1.image = make_sprite("player", (26,26), (200,220,255))
+        self.p1.sync_draw_rects()
+
+        # Build every mob/animal sprite up front so first spawns don't hitch
+        self.sprite_atlas: Dict[Tuple[str, Tuple[int,int]], pygame.Surface] = {}
+        for kind in MOB_KINDS_OVER + MOB_KINDS_NETH + [BOSS_ENDER]:
+            size = self._mob_sprite_size(kind)
+            self.sprite_atlas[(kind.name, size)] = make_sprite(kind.name, size)
+        for kind in ANIMALS:
+            self.sprite_atlas[(kind.name, (22,22))] = make_sprite(kind.name, (22,22))
+        for wpn in (SWORD, ELITE_SWORD, BOSS_LOOT):
+            _slash_surf(wpn.range_px)
 
         self.mobs: List[Mob] = []
         self.animals: List[Animal] = []
@@ -492,19 +673,31 @@ class Game:
         self.running = True
         self.vpad = VirtualPad()
 
+        # Dirty-rect presentation: only regions that changed since the last
+        # frame are pushed with display.update(); anything that repaints the
+        # whole screen (theme, pause, death, error overlay) sets needs_flip.
+        self.needs_flip = True
+        self._frame_key = None
+        self._prev_dirty: List[pygame.Rect] = []
+        self._static_dirty = [pygame.Rect(0, 0, WIDTH, 60),
+                              self.vpad.stick_area(), self.vpad.btn_attack, self.vpad.btn_dash]
+
     # ---------- Spawning ----------
 
     def live_mob_count(self) -> int:
-        return sum(1 for m in self.mobs if m.alive)
+        return len(self.mobs)
 
     def current_pool(self):
         if self.theme == OVERWORLD: return MOB_KINDS_OVER
         if self.theme == NETHER: return MOB_KINDS_NETH + [random.choice(MOB_KINDS_OVER)]
         return MOB_KINDS_OVER
 
+    @staticmethod
+    def _mob_sprite_size(kind: MobKind) -> Tuple[int,int]:
+        return (64,64) if kind.color_key == "boss" else (24,24)
+
     def _place_sprite_for_mob(self, mob: Mob):
-        size = (64,64) if mob.kind.color_key == "boss" else (24,24)
-        mob.image = make_sprite(mob.kind.name, size)
+        mob.image = self.sprite_atlas[(mob.kind.name, self._mob_sprite_size(mob.kind))]
 
     def spawn_mob(self):
         if self.live_mob_count() >= MAX_LIVE_MOBS:
@@ -521,13 +714,13 @@ class Game:
         self.mobs.append(mob)
 
     def spawn_animal(self):
-        if sum(1 for a in self.animals if a.alive) >= MAX_ALIVE_ANIMALS:
+        if len(self.animals) >= MAX_ALIVE_ANIMALS:
             return
         kind = random.choice(ANIMALS)
         x = random.randint(60, WIDTH-80)
         y = random.randint(100, HEIGHT-80)
         a = Animal(kind, x, y)
-        a.image = make_sprite(kind.name, (22,22))
+        a.image = self.sprite_atlas[(kind.name, (22,22))]
         self.animals.append(a)
 
     def spawn_boss(self):
@@ -552,19 +745,18 @@ class Game:
             if isinstance(dmg_target, Mob) and dmg_target.kind.color_key == "boss":
                 self.end_boss_alive = False
 
-    def hunter_melee(self):
-        targets_rects: List[Optional[pygame.Rect]] = []
-        index_to_obj: List[object] = []
-        for m in self.mobs:
-            if m.alive: targets_rects.append(m.rect); index_to_obj.append(m)
-        for a in self.animals:
-            if a.alive: targets_rects.append(a.rect); index_to_obj.append(a)
-        hits_idx = self.p1.try_attack(targets_rects)
+    def hunter_melee(self, now_ms: int):
+        # attack input is held across frames; skip gathering targets while on cooldown
+        if not self.p1.attack_ready(now_ms): return
+        index_to_obj: List[object] = self.mobs + self.animals
+        hits_idx = self.p1.try_attack([o.rect for o in index_to_obj], now_ms)
+        mob_died = animal_died = False
         for idx in hits_idx:
             obj = index_to_obj[idx]
             if isinstance(obj, Mob):
                 self.apply_damage(obj, self.p1.weapon.dmg, self.p1.rect.center)
                 if not obj.alive:
+                    mob_died = True
                     self.p1.score += obj.kind.score
                     if obj.kind.color_key != "boss":
                         if random.random() < (0.10 if obj.kind.color_key == "elite" else 0.05):
@@ -576,8 +768,14 @@ class Game:
             elif isinstance(obj, Animal):
                 self.apply_damage(obj, self.p1.weapon.dmg, self.p1.rect.center)
                 if not obj.alive:
+                    animal_died = True
                     rect = pygame.Rect(obj.rect.centerx-8, obj.rect.centery-8, 18, 18)
                     self.health_packs.append((rect, obj.kind.heal_amount))
+        # melee is the only way mobs/animals die, so self.mobs / self.animals
+        # are swept here (only the list that lost someone) and otherwise
+        # always hold live entities only
+        if mob_died: self.mobs = [m for m in self.mobs if m.alive]
+        if animal_died: self.animals = [a for a in self.animals if a.alive]
 
     def mobs_damage_p1_on_touch(self, mob_entity: Mob):
         if not (mob_entity.alive and self.p1.alive): return
@@ -588,17 +786,20 @@ class Game:
     # ---------- Healing ----------
 
     def try_pick_health(self, who: Player):
-        for i, (r, amount) in list(enumerate(self.health_packs)):
-            if who.alive and who.rect.colliderect(r):
-                who.hp = clamp(who.hp + amount, 0, who.max_hp)
-                self.health_packs.pop(i)
+        if not who.alive: return
+        keep = []
+        for r, amount in self.health_packs:
+            if who.rect.colliderect(r): who.hp = clamp(who.hp + amount, 0, who.max_hp)
+            else: keep.append((r, amount))
+        self.health_packs = keep
 
     # ---------- Archery ----------
 
     def try_skeleton_shoot(self, m: Mob, now_ms: int):
         if not (m.is_archer and m.shots_left > 0 and self.p1.alive): return
-        dist = pygame.Vector2(m.rect.center).distance_to(self.p1.rect.center)
-        if dist > m.shot_range: return
+        mx, my = m.rect.center; px, py = self.p1.rect.center
+        dx = px - mx; dy = py - my
+        if dx*dx + dy*dy > m.shot_range * m.shot_range: return
         if now_ms - m.last_shot_time < m.shot_cooldown_ms: return
         m.last_shot_time = now_ms; m.shots_left -= 1
         origin = pygame.Vector2(m.rect.center); target = pygame.Vector2(self.p1.rect.center)
@@ -608,37 +809,65 @@ class Game:
         self.projectiles.append(Arrow(origin.x, origin.y, dirv.x, dirv.y, dmg=12))
 
     def update_projectiles(self, dt):
-        for i, pr in list(enumerate(self.projectiles)):
-            if not pr.alive: self.projectiles.pop(i); continue
+        if not self.projectiles: return
+        p1 = self.p1
+        p1_rect = p1.rect
+        any_dead = False
+        for pr in self.projectiles:
             pr.update(dt)
-            if not pr.alive: self.projectiles.pop(i); continue
-            if self.p1.alive and pr.rect.colliderect(self.p1.rect):
-                self.apply_damage(self.p1, pr.dmg, pr.rect.center)
-                pr.alive = False; self.projectiles.pop(i)
-                if self.p1.hp <= 0: self.round_over = True
+            if pr.alive and p1.alive and pr.rect.colliderect(p1_rect):
+                self.apply_damage(p1, pr.dmg, pr.rect.center)
+                pr.alive = False
+                if p1.hp <= 0: self.round_over = True
+            if not pr.alive: any_dead = True
+        if any_dead:
+            self.projectiles = [pr for pr in self.projectiles if pr.alive]
 
     # ---------- Draw ----------
 
-    def draw_bg(self):
-        bg = {"OVERWORLD": "bg_over", "NETHER": "bg_neth", "END": "bg_end"}[self.theme]
-        self.screen.fill(COL[bg])
+    def _build_bg(self, theme) -> pygame.Surface:
+        """Static part of the background for one theme: grid, HUD bar, title, portals, hint."""
+        bg = {"OVERWORLD": "bg_over", "NETHER": "bg_neth", "END": "bg_end"}[theme]
+        surf = pygame.Surface((WIDTH, HEIGHT))
+        surf.fill(COL[bg])
         for x in range(0, WIDTH, TILE):
-            pygame.draw.line(self.screen, COL["grid"], (x, 64), (x, HEIGHT), 1)
+            pygame.draw.line(surf, COL["grid"], (x, 64), (x, HEIGHT), 1)
         for y in range(64, HEIGHT, TILE):
-            pygame.draw.line(self.screen, COL["grid"], (0, y), (WIDTH, y), 1)
-        pygame.draw.rect(self.screen, (22, 22, 25), (0, 0, WIDTH, 60))
-        draw_text(self.screen, f"Mob Hunters — Theme: {self.theme}", (12, 12), 24, COL["hud"])
-        draw_text(self.screen, f"Score: {self.p1.score}", (12, 34), 22, COL["hud"])
-        pygame.draw.rect(self.screen, COL["portal_n"], self.portal_n, border_radius=6)
-        draw_text(self.screen, "N", self.portal_n.center, 20, (0,0,0), center=True)
-        pygame.draw.rect(self.screen, COL["portal_e"], self.portal_e, border_radius=6)
-        draw_text(self.screen, "E", self.portal_e.center, 20, (0,0,0), center=True)
+            pygame.draw.line(surf, COL["grid"], (0, y), (WIDTH, y), 1)
+        pygame.draw.rect(surf, (22, 22, 25), (0, 0, WIDTH, 60))
+        draw_text(surf, f"Mob Hunters — Theme: {theme}", (12, 12), 24, COL["hud"])
+        pygame.draw.rect(surf, COL["portal_n"], self.portal_n, border_radius=6)
+        draw_text(surf, "N", self.portal_n.center, 20, (0,0,0), center=True)
+        pygame.draw.rect(surf, COL["portal_e"], self.portal_e, border_radius=6)
+        draw_text(surf, "E", self.portal_e.center, 20, (0,0,0), center=True)
+        draw_text(surf,
+                  "Mobile: left stick + ATTACK/DASH | Desktop: WASD + E/Click, Shift dash",
+                  (12, HEIGHT-26), 18, (230,230,235))
+        return surf.convert()
+
+    def draw_bg(self):
+        self.screen.blit(self._bg_cache[self.theme], (0, 0))
+        self.screen.blit(self._hud_surf("score", self.p1.score, "Score: {}", 22, C_HUD), (12, 34))
+
+    def _hud_surf(self, key, value, fmt, size, color) -> pygame.Surface:
+        """HUD label for `value`; the string is only formatted/rendered again when value changes."""
+        cached = self._hud_cache.get(key)
+        if cached is None or cached[0] != value:
+            cached = self._hud_cache[key] = (value, _render_text(fmt.format(value), size, color))
+        return cached[1]
 
     def draw_bar(self, x, y, w, h, frac, color_ok, color_low, label=None):
         frac = clamp(frac, 0, 1)
         col = color_ok if frac > 0.35 else color_low
-        pygame.draw.rect(self.screen, (40, 40, 48), (x, y, w, h), border_radius=5)
-        pygame.draw.rect(self.screen, col, (x+2, y+2, int((w-4)*frac), h-4), border_radius=5)
+        # the bar only changes when its fill width or color does; reuse it otherwise
+        state = (int((w-4)*frac), tuple(col))
+        cached = self._bar_cache.get((x, y, w, h))
+        if cached is None or cached[0] != state:
+            bar = pygame.Surface((w, h), pygame.SRCALPHA)
+            pygame.draw.rect(bar, (40, 40, 48), (0, 0, w, h), border_radius=5)
+            pygame.draw.rect(bar, col, (2, 2, state[0], h-4), border_radius=5)
+            cached = self._bar_cache[(x, y, w, h)] = (state, _display_alpha(bar))
+        self.screen.blit(cached[1], (x, y))
         if label: draw_text(self.screen, label, (x, y-12), 14, (220,220,230))
 
     # ---------- Theme transitions ----------
@@ -660,6 +889,7 @@ class Game:
 
     def update(self, dt):
         if self.paused or self.round_over: return
+        now_ms = pygame.time.get_ticks()  # one clock read per frame, shared by all cooldowns
         pressed = pygame.key.get_pressed()
 
         # Movement: keyboard or virtual stick
@@ -676,7 +906,7 @@ class Game:
         key_attack = is_down(pressed, pygame.K_e) == 1
         touch_attack = self.vpad.consume_attack_tap()
         if mouse_attack or key_attack or touch_attack:
-            self.hunter_melee()
+            self.hunter_melee(now_ms)
 
         # Portals
         if self.p1.rect.colliderect(self.portal_n): self.theme = NETHER
@@ -696,86 +926,108 @@ class Game:
             self.animal_spawn_timer = 0; self.spawn_animal()
 
         # AI, arrows
-        now_ms = pygame.time.get_ticks()
         for m in self.mobs:
-            if not m.alive: continue
-            m.ai(self.p1.rect.center)
+            m.ai(self.p1.rect.center)  # per mob: contact knockback can move p1 mid-loop
             self.mobs_damage_p1_on_touch(m)
-            self.try_skeleton_shoot(m, now_ms)
+            if m.shots_left: self.try_skeleton_shoot(m, now_ms)
 
         for a in self.animals:
-            if not a.alive: continue
             a.ai()
 
         # Loot
-        for i, (r, wpn) in list(enumerate(self.weapon_drops)):
-            if self.p1.rect.colliderect(r):
-                self.p1.weapon = wpn; self.weapon_drops.pop(i)
+        keep = []
+        for r, wpn in self.weapon_drops:
+            if self.p1.rect.colliderect(r): self.p1.weapon = wpn
+            else: keep.append((r, wpn))
+        self.weapon_drops = keep
 
         self.try_pick_health(self.p1)
         self.update_projectiles(dt)
 
-        # Cleanup
-        self.mobs = [m for m in self.mobs if m.alive]
-        self.animals = [a for a in self.animals if a.alive]
+        self.p1.sync_draw_rects()  # after move and any contact/arrow knockback
 
     def render(self):
+        # locals for the hot names; saves attribute lookups per use
+        screen, p1 = self.screen, self.p1
         self.draw_bg()
 
-        for rect, _ in self.weapon_drops:
-            pygame.draw.rect(self.screen, COL["drop"], rect, border_radius=4)
-        for rect, _ in self.health_packs:
-            pygame.draw.rect(self.screen, COL["pack"], rect, border_radius=4)
-            cx, cy = rect.center
-            pygame.draw.line(self.screen, (20,60,30), (cx-5, cy), (cx+5, cy), 2)
-            pygame.draw.line(self.screen, (20,60,30), (cx, cy-5), (cx, cy+5), 2)
+        loot = [(_loot_surf("drop", r.size), r.topleft) for r, _ in self.weapon_drops]
+        loot += [(_loot_surf("pack", r.size), r.topleft) for r, _ in self.health_packs]
+        if loot: screen.fblits(loot)
 
-        for pr in self.projectiles:
-            if pr.alive: pr.draw(self.screen)
+        # one fblits call for every arrow/mob/animal sprite, then names + HP bars on top
+        live = self.mobs + self.animals
+        sprite_blits = [pr.sprite_blit() for pr in self.projectiles if pr.alive]
+        sprite_blits += [pair for pair in (e.sprite_blit() for e in live) if pair]
+        if sprite_blits: screen.fblits(sprite_blits)
+        for e in live: e.draw(screen)
 
-        for m in self.mobs:
-            if m.alive: m.draw(self.screen)
-
-        for a in self.animals:
-            if a.alive: a.draw(self.screen)
-
-        if self.p1.alive:
-            if self.p1.image:
-                r = self.p1.image.get_rect(center=self.p1.rect.center)
-                self.screen.blit(self.p1.image, r.topleft)
+        if p1.alive:
+            if p1.image:
+                screen.blit(p1.image, p1._sprite_pos)
             else:
-                pygame.draw.rect(self.screen, (240,240,255), self.p1.rect, border_radius=6)
-            pygame.draw.rect(self.screen, COL["p1"], self.p1.rect.inflate(4,4), width=2, border_radius=8)
-            if self.p1.slash_timer > 0:
-                pygame.draw.circle(self.screen, COL["slash"], self.p1.rect.center, int(self.p1.slash_radius), 2)
-
-        self.draw_bar(220, 16, 260, 16, self.p1.hp / self.p1.max_hp, COL["hp_ok"], COL["hp_low"], "P1 HP")
-        draw_text(self.screen, f"Weapon: {self.p1.weapon.name}", (500, 14), 18, COL["hud"])
-        draw_text(self.screen, f"Live mobs: {self.live_mob_count()}/{MAX_LIVE_MOBS}", (720, 14), 18, COL["hud"])
-        draw_text(self.screen, f"Animals: {sum(1 for a in self.animals if a.alive)}/{MAX_ALIVE_ANIMALS}", (720, 34), 18, COL["hud"])
-
-        draw_text(self.screen,
-                  "Mobile: left stick + ATTACK/DASH | Desktop: WASD + E/Click, Shift dash",
-                  (12, HEIGHT-26), 18, (230,230,235))
+                pygame.draw.rect(screen, (240,240,255), p1.rect, border_radius=6)
+            pygame.draw.rect(screen, C_P1, p1._outline_rect, width=2, border_radius=8)
+            if p1.slash_timer > 0:
+                slash = _slash_surf(int(p1.slash_radius))
+                screen.blit(slash, slash.get_rect(center=p1._center),
+                            special_flags=pygame.BLEND_PREMULTIPLIED)
+
+        self.draw_bar(220, 16, 260, 16, p1.hp / p1.max_hp, C_HP_OK, C_HP_LOW, "P1 HP")
+        screen.blit(self._hud_surf("weapon", p1.weapon.name, "Weapon: {}", 18, C_HUD), (500, 14))
+        screen.blit(self._hud_surf("mobs", len(self.mobs), HUD_MOBS_FMT, 18, C_HUD), (720, 14))
+        screen.blit(self._hud_surf("animals", len(self.animals), HUD_ANIMALS_FMT, 18, C_HUD), (720, 34))
 
         if self.paused:
-            draw_text(self.screen, "PAUSED", (WIDTH//2, HEIGHT//2-20), 48, (255,255,255), center=True)
-            draw_text(self.screen, "Press P to resume", (WIDTH//2, HEIGHT//2+20), 24, (230,230,230), center=True)
+            draw_text(screen, "PAUSED", (WIDTH//2, HEIGHT//2-20), 48, (255,255,255), center=True)
+            draw_text(screen, "Press P to resume", (WIDTH//2, HEIGHT//2+20), 24, (230,230,230), center=True)
 
         if self.round_over:
-            draw_text(self.screen, "You Died!", (WIDTH//2, HEIGHT//2-60), 50, (255,240,240), center=True)
-            draw_text(self.screen, f"Final Score: {self.p1.score}", (WIDTH//2, HEIGHT//2-12), 30, (255,255,255), center=True)
-            draw_text(self.screen, "Press R to restart", (WIDTH//2, HEIGHT//2+34), 24, (240,240,240), center=True)
+            draw_text(screen, "You Died!", (WIDTH//2, HEIGHT//2-60), 50, (255,240,240), center=True)
+            draw_text(screen, f"Final Score: {p1.score}", (WIDTH//2, HEIGHT//2-12), 30, (255,255,255), center=True)
+            draw_text(screen, "Press R to restart", (WIDTH//2, HEIGHT//2+34), 24, (240,240,240), center=True)
+
+        self.vpad.draw(screen)
+        self._present()
+
+    def _dirty_rects(self) -> List[pygame.Rect]:
+        dirty = list(self._static_dirty)
+        dirty += [r for r, _ in self.weapon_drops] + [r for r, _ in self.health_packs]
+        dirty += [pr.rect.inflate(28, 28) for pr in self.projectiles if pr.alive]
+        dirty += [e.dirty_rect() for e in self.mobs + self.animals]
+        if self.p1.alive:
+            dirty.append(self.p1.dirty_rect())
+            if self.p1.slash_timer > 0:
+                d = 2 * int(self.p1.slash_radius) + 4
+                dirty.append(pygame.Rect(0, 0, d, d).move(self.p1.rect.centerx - d//2, self.p1.rect.centery - d//2))
+        return dirty
+
+    def _present(self):
+        frame_key = (self.theme, self.paused, self.round_over)
+        dirty = self._dirty_rects()
+        if self.needs_flip or frame_key != self._frame_key:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._prev_dirty + dirty)
+        self.needs_flip = False
+        self._frame_key = frame_key
+        self._prev_dirty = dirty
 
-        self.vpad.draw(self.screen)
-        pygame.display.flip()
+    def step(self, dt):
+        self.handle_events()
+        self.update(dt)
+        self.render()
 
     def handle_events(self):
         for e in pygame.event.get():
-            self.vpad.handle_event(e)
-            if e.type == pygame.QUIT:
+            t = e.type
+            if t in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION):
+                self.vpad.handle_event(e)
+            elif t == pygame.QUIT:
                 self.running = False
-            if e.type == pygame.KEYDOWN:
+            elif t == pygame.WINDOWEXPOSED:
+                self.needs_flip = True  # dirty-rect updates alone won't repaint the window
+            elif t == pygame.KEYDOWN:
                 if e.key == pygame.K_ESCAPE: self.running = False
                 if e.key == pygame.K_p: self.paused = not self.paused
                 if e.key == pygame.K_r and self.round_over: self.restart()
@@ -796,16 +1048,19 @@ async def main():
 
     while game.running:
         dt = game.clock.tick(FPS)
-        try:
-            game.handle_events()
-            game.update(dt)
-            game.render()
-        except Exception:
-            import traceback
-            tb = traceback.format_exc().splitlines()
-            print("\n".join(tb))
-            _draw_error_overlay(game.screen, tb)
-        await asyncio.sleep(0)
+        if ERROR_OVERLAY:
+            try:
+                game.step(dt)
+            except Exception:
+                import traceback
+                tb = traceback.format_exc().splitlines()
+                print("\n".join(tb))
+                _draw_error_overlay(game.screen, tb)
+                game.needs_flip = True
+        else:
+            game.step(dt)
+        # the browser needs a yield every frame; natively nothing else runs on the loop
+        if IS_WEB: await asyncio.sleep(0)
 
     pygame.quit()
 